@@ -1,9 +1,34 @@
+import asyncio
+import dataclasses
+import datetime
+import functools
+import hashlib
+import logging
+import math
+import os
+import pathlib
+import tempfile
+import time
 from contextlib import asynccontextmanager
-from typing import Annotated, AsyncGenerator, TypeAlias
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Sequence,
+    TypeAlias,
+)
+
+from fastapi import FastAPI, HTTPException, Path, Query, Request
+from fastapi.responses import Response
+from pydantic import TypeAdapter
 
-from fastapi import FastAPI, Path
+from api import compression, ical, images, memory, query, utils
+from api.cache import CacheEntry, TTLCache
 
-from api.scraper import (
+from api.models import (
     Activity,
     ClubSoc,
     CommitteeMember,
@@ -13,21 +38,90 @@ from api.scraper import (
     Info,
     InfoLink,
     InfoAward,
-    Scraper,
 )
 
+if TYPE_CHECKING:
+    from api.scraper import Scraper
+
 from fastapi.middleware.cors import CORSMiddleware
 
 
 
-scraper = Scraper()
+logger = logging.getLogger(__name__)
+
+WARM_UP = os.environ.get("WARM_UP", "").lower() in ("1", "true", "yes")
+"""Whether to import and construct the scraper's dependencies in the background on startup.
+
+Otherwise they are loaded when the first request needs them.
+"""
+
+IMAGE_PROXY = os.environ.get("IMAGE_PROXY") or None
+"""The URL the API is served at, which gallery photos and icons are proxied through.
+
+Images link to the university websites if unset.
+"""
+IMAGE_PROXY_KEY = os.environ.get("IMAGE_PROXY_KEY", "").encode()
+"""The key image proxy URLs are signed with, which is required if `IMAGE_PROXY` is set.
+
+It must be the same for every replica and across restarts, or URLs which were
+already returned would stop working.
+"""
+if IMAGE_PROXY is not None and not IMAGE_PROXY_KEY:
+    raise RuntimeError("IMAGE_PROXY_KEY must be set when IMAGE_PROXY is set")
+IMAGE_CACHE_DIR = pathlib.Path(
+    os.environ.get("IMAGE_CACHE_DIR")
+    or pathlib.Path(tempfile.gettempdir(), "clubsandsocs-images")
+)
+"""The directory proxied images are cached in."""
+IMAGE_CACHE_SIZE = int(os.environ.get("IMAGE_CACHE_SIZE", 512)) * 1024 * 1024
+"""The maximum size of the image cache (`IMAGE_CACHE_SIZE` is in MiB)."""
+
+_scraper: "Scraper | None" = None
+image_cache = images.ImageCache(IMAGE_CACHE_DIR, IMAGE_CACHE_SIZE)
+responses = TTLCache(maxsize=4096)
+"""Encoded list responses, keyed by request path and query."""
+feeds = TTLCache(ttl=math.inf, maxsize=4096)
+"""Encoded iCalendar feeds, keyed by request path."""
+refreshes = TTLCache(ttl=60, maxsize=4096)
+"""Recent background refreshes, so failing scrapes aren't retried on every poll."""
+failures = TTLCache(maxsize=4096)
+"""The last error from a failed background refresh, keyed like the scraper cache."""
+background_tasks: set[asyncio.Task[Any]] = set()
+site_refreshes: set[str] = set()
+"""Sites whose listings and calendar sections are being refreshed."""
+
+CALENDAR_SECTIONS = ("activities", "events", "fixtures")
+"""The scraper cache sections which are included in calendar feeds."""
+SITE_REFRESH_CONCURRENCY = 4
+"""The most calendar sections a site-wide refresh scrapes at once."""
+
+
+def get_scraper() -> "Scraper":
+    """Get the scraper, importing `api.scraper` (bs4, html5lib and aiohttp) on first use."""
+    global _scraper
+    if _scraper is None:
+        from api.scraper import Scraper
+
+        _scraper = Scraper(image_proxy=IMAGE_PROXY, image_proxy_key=IMAGE_PROXY_KEY)
+
+    return _scraper
+
+
+def warm_up() -> None:
+    """Import the scraper's dependencies and construct the datetime parser."""
+    import api.scraper  # noqa: F401
+
+    utils.get_parser()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    if WARM_UP:
+        run_in_background(asyncio.to_thread(warm_up))
     yield
     # Close session on shutdown
-    await scraper.session.close()
+    if _scraper is not None:
+        await _scraper.close()
 
 
 app = FastAPI(
@@ -38,12 +132,14 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(compression.CompressionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["GET"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
 SITE_PARAM: TypeAlias = Annotated[
@@ -60,84 +156,650 @@ ID_PARAM: TypeAlias = Annotated[
     str, Path(description="ID of the club or society.", examples=["redbrick"])
 ]
 
+WIDTH_PARAM: TypeAlias = Annotated[
+    int | None,
+    Query(
+        description=f"Width to scale the image down to ({', '.join(map(str, images.THUMBNAIL_WIDTHS))}).",
+        examples=[320],
+    ),
+]
+OFFSET_PARAM: TypeAlias = Annotated[
+    int, Query(ge=0, description="Number of items to skip.")
+]
+LIMIT_PARAM: TypeAlias = Annotated[
+    int | None, Query(ge=1, description="Maximum number of items to return.")
+]
+FIELDS_PARAM: TypeAlias = Annotated[
+    str | None,
+    Query(
+        description="Comma-separated list of fields to include in each item.",
+        examples=["name,start,location"],
+    ),
+]
+DAY_PARAM: TypeAlias = Annotated[
+    str | None,
+    Query(description="Only include items on this day.", examples=["monday"]),
+]
+EVENT_TYPE_PARAM: TypeAlias = Annotated[
+    str | None,
+    Query(
+        alias="type",
+        description="Only include items of this type.",
+        examples=["IN-PERSON"],
+    ),
+]
+START_AFTER_PARAM: TypeAlias = Annotated[
+    datetime.datetime | None,
+    Query(description="Only include items starting at or after this time."),
+]
+START_BEFORE_PARAM: TypeAlias = Annotated[
+    datetime.datetime | None,
+    Query(description="Only include items starting at or before this time."),
+]
+IS_LOCKED_PARAM: TypeAlias = Annotated[
+    bool | None,
+    Query(description="Only include clubs or societies which are (not) locked."),
+]
+
+
+def encoded_response(
+    request: Request,
+    body: compression.EncodedBody,
+    headers: dict[str, str] | None = None,
+    media_type: str = "application/json",
+) -> Response:
+    """Respond with the variant of `body` the client accepts."""
+    coding, content = body.select(request.headers.get("accept-encoding"))
+
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+
+    return Response(content, headers=headers, media_type=media_type)
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's `If-None-Match` header matches `etag`."""
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+@functools.cache
+def type_adapter(model: Any) -> TypeAdapter[Any]:
+    """Get the adapter which validates and serializes `model`."""
+    return TypeAdapter(model)
+
+
+async def cached_response(
+    request: Request,
+    source: Any,
+    render: Callable[[], tuple[bytes, dict[str, str]]],
+) -> Response:
+    """Respond with the body and headers `render` builds from cached `source` data.
+
+    The encoded body is cached by request path and query until `source` is
+    replaced by a new scrape, so it is only serialized and compressed once.
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    entry = responses.get(key)
+
+    if entry is not None and entry.value[0] is source:
+        _, headers, body = entry.value
+    else:
+        raw, headers = render()
+        body = await asyncio.to_thread(compression.encode_body, raw)
+        responses.set(key, (source, headers, body))
+
+    return encoded_response(request, body, headers)
+
+
+async def list_response(
+    request: Request,
+    items: Sequence[Any],
+    model: type,
+    offset: int = 0,
+    limit: int | None = None,
+    fields: str | None = None,
+    **filters: Any,
+) -> Response:
+    """Filter, paginate and project a list of cached `model` items.
+
+    Items are serialized like the endpoint's `response_model`, keeping only
+    `fields` if given. The total number of matching items is returned in the
+    `X-Total-Count` header.
+    """
+
+    def render() -> tuple[bytes, dict[str, str]]:
+        matching = query.filter_items(items, **filters)
+        include = None
+        if fields is not None:
+            try:
+                include = {"__all__": set(query.parse_fields(fields, model))}
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        adapter = type_adapter(list[model])  # type: ignore[valid-type]
+        page = adapter.validate_python(query.paginate(matching, offset, limit))
+        raw = adapter.dump_json(page, include=include)
+        return raw, {"X-Total-Count": str(len(matching))}
+
+    return await cached_response(request, items, render)
+
+
+@dataclasses.dataclass
+class CalendarFeed:
+    """A generated iCalendar feed."""
+
+    sources: tuple[CacheEntry | None, ...]
+    """The scraper cache entries the feed was generated from."""
+    version: int
+    """The scraper cache version when the feed was last checked."""
+    stale_at: float
+    """When the oldest source expires (`time.monotonic()`)."""
+    stamp: datetime.datetime
+    """When the feed's content last changed."""
+    body: compression.EncodedBody
+    """The encoded feed."""
+    etag: str
+    """The feed's ETag."""
+
+
+def run_in_background(coro: Awaitable[Any]) -> None:
+    """Run `coro` without waiting for it."""
+    task = asyncio.ensure_future(coro)
+    background_tasks.add(task)
+    task.add_done_callback(finish_background_task)
+
+
+def finish_background_task(task: asyncio.Task[Any]) -> None:
+    background_tasks.discard(task)
+    if not task.cancelled() and (e := task.exception()) is not None:
+        logger.error("background task failed", exc_info=e)
+
+
+async def refresh(key: tuple[Any, ...]) -> None:
+    """Scrape a scraper cache section, recording the error in `failures` if it fails."""
+    site, section, *args = key
+    fetch = getattr(get_scraper(), f"fetch_{section}")
+    try:
+        await fetch(site, *args)
+    except Exception as e:
+        logger.warning("failed to refresh %s", key, exc_info=e)
+        failures.set(key, e)
+    else:
+        failures.pop(key)
+
+
+def needs_refresh(key: tuple[Any, ...], entry: CacheEntry | None) -> bool:
+    """Whether a section is missing or expired, and not refreshed in the last minute."""
+    if entry is not None and not get_scraper().cache.is_expired(entry):
+        return False
+
+    return refreshes.get(key) is None
+
+
+def refresh_if_stale(key: tuple[Any, ...], entry: CacheEntry | None) -> None:
+    """Refresh a calendar section in the background if it's missing or expired.
+
+    Never scrapes while a client is waiting, and at most once a minute per section.
+    """
+    if needs_refresh(key, entry):
+        refreshes.set(key, True)
+        run_in_background(refresh(key))
+
+
+def group_keys(site: str) -> list[tuple[Any, ...]]:
+    """Get the scraper cache keys of `site`'s club and society listings."""
+    return [(site, "group", group_type) for group_type in GroupType]
+
+
+def site_calendar_keys(site: str) -> list[tuple[Any, ...]]:
+    """Get the calendar section keys of every group in `site`'s cached listings."""
+    cache = get_scraper().cache
+    keys = []
+    for key in group_keys(site):
+        if (entry := cache.peek(key)) is not None:
+            keys += [
+                (site, section, group.id, key[2])
+                for group in entry.value
+                for section in CALENDAR_SECTIONS
+            ]
+
+    return sorted(
+        keys, key=lambda key: (key[3].value, key[2], CALENDAR_SECTIONS.index(key[1]))
+    )
+
+
+async def refresh_site(site: str) -> None:
+    """Refresh `site`'s listings, then its groups' missing or expired calendar sections.
+
+    At most `SITE_REFRESH_CONCURRENCY` sections are scraped at once.
+    """
+    cache = get_scraper().cache
+    semaphore = asyncio.Semaphore(SITE_REFRESH_CONCURRENCY)
+
+    async def refresh_section(key: tuple[Any, ...]) -> None:
+        async with semaphore:
+            await refresh(key)
+
+    try:
+        for key in group_keys(site):
+            if needs_refresh(key, cache.peek(key)):
+                refreshes.set(key, True)
+                await refresh(key)
+
+        sections = []
+        for key in site_calendar_keys(site):
+            if needs_refresh(key, cache.peek(key)):
+                refreshes.set(key, True)
+                sections.append(refresh_section(key))
+        await asyncio.gather(*sections)
+    finally:
+        site_refreshes.discard(site)
+
+
+def unavailable(name: str, site: str, errors: list[Exception]) -> HTTPException:
+    """Get the error for a feed with no cached data, given its failed refreshes."""
+    if any(getattr(error, "status", None) == 404 for error in errors):
+        return HTTPException(status_code=404, detail=f"'{name}' was not found")
+    if errors:
+        return HTTPException(
+            status_code=502, detail=f"failed to fetch '{name}' from {site}"
+        )
+
+    return HTTPException(
+        status_code=503,
+        detail="calendar is being generated, try again shortly",
+        headers={"Retry-After": "30"},
+    )
+
+
+async def calendar_response(
+    request: Request,
+    name: str,
+    sources: list[tuple[str, CacheEntry]],
+    fingerprint: tuple[CacheEntry | None, ...],
+) -> Response:
+    """Respond with the feed for `sources`, regenerating it only if they changed."""
+    key = request.url.path
+    cache = get_scraper().cache
+    entry = feeds.peek(key)
+    feed: CalendarFeed | None = entry.value if entry is not None else None
+
+    if feed is None or feed.sources != fingerprint:
+        items = [(path, source.value) for path, source in sources]
+        raw = ical.build_calendar(name, items, feed.stamp) if feed else b""
+
+        if feed is None or raw != feed.body.raw:
+            stamp = datetime.datetime.now(datetime.timezone.utc)
+            raw = ical.build_calendar(name, items, stamp)
+            body = await asyncio.to_thread(compression.encode_body, raw)
+            etag = f'W/"{hashlib.sha256(raw).hexdigest()[:32]}"'
+            feed = CalendarFeed(
+                sources=fingerprint,
+                version=cache.version,
+                stale_at=math.inf,
+                stamp=stamp,
+                body=body,
+                etag=etag,
+            )
+        else:
+            feed = dataclasses.replace(feed, sources=fingerprint)
+
+        feeds.set(key, feed)
+
+    feed.version = cache.version
+    feed.stale_at = min(
+        (source.stored_at + cache.ttl for _, source in sources), default=math.inf
+    )
+    return feed_response(request, feed)
+
+
+def feed_response(request: Request, feed: CalendarFeed) -> Response:
+    """Respond with `feed`, supporting conditional requests with `If-None-Match`."""
+    headers = {"ETag": feed.etag, "Cache-Control": "public, max-age=300"}
+    if not_modified(request, feed.etag):
+        return Response(status_code=304, headers=headers)
+
+    return encoded_response(
+        request, feed.body, headers, media_type="text/calendar; charset=utf-8"
+    )
+
+
+# declared before `/{site}/{type}`, which would otherwise match it
+@app.get(
+    "/{site}/calendar.ics",
+    summary="Get an iCalendar feed of every club and society's events, activities and fixtures.",
+    response_class=Response,
+)
+async def get_site_calendar(request: Request, site: SITE_PARAM) -> Response:
+    cache = get_scraper().cache
+    entry = feeds.peek(request.url.path)
+    feed: CalendarFeed | None = entry.value if entry is not None else None
+    if (
+        feed is not None
+        and feed.version == cache.version
+        and time.monotonic() < feed.stale_at
+    ):
+        return feed_response(request, feed)
+
+    listings = group_keys(site)
+    keys = listings + site_calendar_keys(site)
+    entries = tuple(cache.peek(key) for key in keys)
+    if site not in site_refreshes and any(
+        needs_refresh(key, entry) for key, entry in zip(keys, entries)
+    ):
+        site_refreshes.add(site)
+        run_in_background(refresh_site(site))
+
+    # a partial feed would make calendar apps delete the events which are missing
+    if any(
+        entry is None and failures.get(key) is None
+        for key, entry in zip(keys, entries)
+    ) or all(entry is None for entry in entries[: len(listings)]):
+        if feed is not None:
+            return feed_response(request, feed)
+
+        errors = [
+            failure.value
+            for key in listings
+            if (failure := failures.get(key)) is not None
+        ]
+        # the listings which haven't failed may still arrive
+        raise unavailable(site, site, errors if len(errors) == len(listings) else [])
+
+    sources = [
+        (f"{site}/{key[3].value}/{key[2]}", entry)
+        for key, entry in zip(keys[len(listings) :], entries[len(listings) :])
+        if entry is not None
+    ]
+    return await calendar_response(request, site, sources, entries)
+
 
 @app.get(
-    "/{site}/{type}/{id}/activities", summary="Get a club or society's activities."
+    "/{site}/{type}/{id}/calendar.ics",
+    summary="Get an iCalendar feed of a club or society's events, activities and fixtures.",
+    response_class=Response,
+)
+async def get_calendar(
+    request: Request,
+    site: SITE_PARAM,
+    type: TYPE_PARAM,
+    id: ID_PARAM,
+) -> Response:
+    keys = [(site, section, id, type) for section in CALENDAR_SECTIONS]
+    entries = tuple(get_scraper().cache.peek(key) for key in keys)
+    for key, entry in zip(keys, entries):
+        refresh_if_stale(key, entry)
+
+    if all(entry is None for entry in entries):
+        errors = [
+            failure.value for key in keys if (failure := failures.get(key)) is not None
+        ]
+        raise unavailable(id, site, errors)
+
+    path = f"{site}/{type.value}/{id}"
+    return await calendar_response(
+        request,
+        id,
+        [(path, entry) for entry in entries if entry is not None],
+        entries,
+    )
+
+
+# declared before the club and society routes, which would otherwise match it
+@app.get(
+    "/img/{site}/{path:path}",
+    summary="Get a gallery photo or icon through the image proxy.",
+    response_class=Response,
+)
+async def get_image(
+    request: Request,
+    site: SITE_PARAM,
+    path: Annotated[str, Path(description="Path of the image on the website.")],
+    s: Annotated[str, Query(description="Signature of the image URL.")] = "",
+    w: WIDTH_PARAM = None,
+) -> Response:
+    if IMAGE_PROXY is None:
+        raise HTTPException(status_code=404, detail="image proxy is disabled")
+
+    # only proxy images the scraper returned, not arbitrary URLs
+    url = images.upstream_url(site, path)
+    if not images.verify(IMAGE_PROXY_KEY, url, s):
+        raise HTTPException(status_code=403, detail="invalid image signature")
+    if w is not None and w not in images.THUMBNAIL_WIDTHS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"w must be one of {', '.join(map(str, images.THUMBNAIL_WIDTHS))}",
+        )
+
+    etag = f'"{images.cache_key(url, w)[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+
+    # cached images never change, so this doesn't need to touch the disk
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    scraper = get_scraper()
+    # already imported by `get_scraper`
+    import aiohttp
+
+    try:
+        image = await image_cache.get(url, w, lambda: scraper.fetch_image(url))
+    except aiohttp.ClientResponseError as e:
+        raise HTTPException(
+            status_code=404 if e.status == 404 else 502,
+            detail=f"failed to fetch '{url}' ({e.status})",
+        )
+    except (aiohttp.ClientError, TimeoutError) as e:
+        raise HTTPException(status_code=502, detail=f"failed to fetch '{url}' ({e})")
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return Response(image.data, headers=headers, media_type=image.content_type)
+
+
+@app.get(
+    "/{site}/{type}/{id}/activities",
+    summary="Get a club or society's activities.",
+    response_model=list[Activity],
 )
 async def get_activities(
+    request: Request,
     site: SITE_PARAM,
     type: TYPE_PARAM,
     id: ID_PARAM,
-) -> list[Activity]:
-    return await scraper.fetch_activities(site, id, type)
+    offset: OFFSET_PARAM = 0,
+    limit: LIMIT_PARAM = None,
+    fields: FIELDS_PARAM = None,
+    day: DAY_PARAM = None,
+    activity_type: EVENT_TYPE_PARAM = None,
+    start_after: START_AFTER_PARAM = None,
+    start_before: START_BEFORE_PARAM = None,
+) -> Response:
+    return await list_response(
+        request,
+        await get_scraper().fetch_activities(site, id, type),
+        Activity,
+        offset,
+        limit,
+        fields,
+        day=day,
+        type=activity_type,
+        start_after=start_after,
+        start_before=start_before,
+    )
 
 @app.get(
-    "/{site}/{type}/{id}/fixtures", summary="Get a club or society's fixtures."
+    "/{site}/{type}/{id}/fixtures",
+    summary="Get a club or society's fixtures.",
+    response_model=list[Fixture],
 )
 async def get_fixtures(
+    request: Request,
     site: SITE_PARAM,
     type: TYPE_PARAM,
     id: ID_PARAM,
-) -> list[Fixture]:
-    return await scraper.fetch_fixtures(site, id, type)
+    offset: OFFSET_PARAM = 0,
+    limit: LIMIT_PARAM = None,
+    fields: FIELDS_PARAM = None,
+    fixture_type: EVENT_TYPE_PARAM = None,
+    start_after: START_AFTER_PARAM = None,
+    start_before: START_BEFORE_PARAM = None,
+) -> Response:
+    return await list_response(
+        request,
+        await get_scraper().fetch_fixtures(site, id, type),
+        Fixture,
+        offset,
+        limit,
+        fields,
+        type=fixture_type,
+        start_after=start_after,
+        start_before=start_before,
+    )
 
-@app.get("/{site}/{type}/{id}/events", summary="Get a club or society's events.")
+@app.get(
+    "/{site}/{type}/{id}/events",
+    summary="Get a club or society's events.",
+    response_model=list[Event],
+)
 async def get_events(
+    request: Request,
     site: SITE_PARAM,
     type: TYPE_PARAM,
     id: ID_PARAM,
-) -> list[Event]:
-    return await scraper.fetch_events(site, id, type)
+    offset: OFFSET_PARAM = 0,
+    limit: LIMIT_PARAM = None,
+    fields: FIELDS_PARAM = None,
+    day: DAY_PARAM = None,
+    event_type: EVENT_TYPE_PARAM = None,
+    start_after: START_AFTER_PARAM = None,
+    start_before: START_BEFORE_PARAM = None,
+) -> Response:
+    return await list_response(
+        request,
+        await get_scraper().fetch_events(site, id, type),
+        Event,
+        offset,
+        limit,
+        fields,
+        day=day,
+        type=event_type,
+        start_after=start_after,
+        start_before=start_before,
+    )
 
 
 @app.get(
     "/{site}/{type}/{id}/committee",
     summary="Get a club or society's committee members.",
+    response_model=list[CommitteeMember],
 )
 async def get_committee(
+    request: Request,
     site: SITE_PARAM,
     type: TYPE_PARAM,
     id: ID_PARAM,
-) -> list[CommitteeMember]:
-    return await scraper.fetch_committee(site, id, type)
+) -> Response:
+    return await list_response(
+        request, await get_scraper().fetch_committee(site, id, type), CommitteeMember
+    )
 
 
 @app.get(
-    "/{site}/{type}/{id}/gallery", summary="Get a club or society's gallery of photos."
+    "/{site}/{type}/{id}/gallery",
+    summary="Get a club or society's gallery of photos.",
+    response_model=list[str],
 )
 async def get_gallery(
+    request: Request,
     site: SITE_PARAM,
     type: TYPE_PARAM,
     id: ID_PARAM,
-) -> list[str]:
-    return await scraper.fetch_gallery(site, id, type)
+    offset: OFFSET_PARAM = 0,
+    limit: LIMIT_PARAM = None,
+) -> Response:
+    return await list_response(
+        request, await get_scraper().fetch_gallery(site, id, type), str, offset, limit
+    )
 
 
-@app.get("/{site}/{type}", summary="List clubs or societies in a university.")
+@app.get(
+    "/{site}/{type}",
+    summary="List clubs or societies in a university.",
+    response_model=list[ClubSoc],
+)
 async def get_group_items(
+    request: Request,
     site: SITE_PARAM,
     type: TYPE_PARAM,
-) -> list[ClubSoc]:
-    return await scraper.fetch_group(site, type)
+    offset: OFFSET_PARAM = 0,
+    limit: LIMIT_PARAM = None,
+    fields: FIELDS_PARAM = None,
+    is_locked: IS_LOCKED_PARAM = None,
+) -> Response:
+    return await list_response(
+        request,
+        await get_scraper().fetch_group(site, type),
+        ClubSoc,
+        offset,
+        limit,
+        fields,
+        is_locked=is_locked,
+    )
 
 
-@app.get("/{site}/{type}/{id}", summary="Get info about a club or society.")
-async def get_info(site: SITE_PARAM, type: TYPE_PARAM, id: ID_PARAM) -> Info:
-    return await scraper.fetch_info(site, id, type)
+@app.get(
+    "/{site}/{type}/{id}",
+    summary="Get info about a club or society.",
+    response_model=Info,
+)
+async def get_info(
+    request: Request, site: SITE_PARAM, type: TYPE_PARAM, id: ID_PARAM
+) -> Response:
+    info = await get_scraper().fetch_info(site, id, type)
+    return await cached_response(
+        request, info, lambda: (type_adapter(Info).dump_json(info), {})
+    )
 
 
-@app.get("/{site}/{type}/{id}/awards", summary="Get a club or society's list of awards.")
+@app.get(
+    "/{site}/{type}/{id}/awards",
+    summary="Get a club or society's list of awards.",
+    response_model=list[InfoAward],
+)
 async def get_awards(
+    request: Request,
     site: SITE_PARAM,
     type: TYPE_PARAM,
     id: ID_PARAM,
-) -> list[InfoAward]:
-    return await scraper.fetch_awards(site, id, type)
+) -> Response:
+    return await list_response(
+        request, await get_scraper().fetch_awards(site, id, type), InfoAward
+    )
 
-@app.get("/{site}/{type}/{id}/links", summary="Get a club or society's list of links.")
+@app.get(
+    "/{site}/{type}/{id}/links",
+    summary="Get a club or society's list of links.",
+    response_model=list[InfoLink],
+)
 async def get_links(
+    request: Request,
     site: SITE_PARAM,
     type: TYPE_PARAM,
     id: ID_PARAM,
-) -> list[InfoLink]:
-    return await scraper.fetch_links(site, id, type)
+) -> Response:
+    return await list_response(
+        request, await get_scraper().fetch_links(site, id, type), InfoLink
+    )
+
+
+@app.get(
+    "/memory",
+    summary="Get the memory used by cached data per site and section (in bytes).",
+)
+async def get_memory() -> dict[str, dict[str, int]]:
+    # don't import the scraper just to report that nothing is cached
+    cache = _scraper.cache if _scraper is not None else TTLCache()
+    return memory.usage(cache, responses, feeds)
@@ -0,0 +1,153 @@
+import asyncio
+import dataclasses
+import functools
+import time
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T_ = TypeVar("T_")
+
+DEFAULT_TTL = 15 * 60
+"""How long extracted data is kept before it is scraped again (in seconds)."""
+
+
+@dataclasses.dataclass(eq=False)
+class CacheEntry:
+    """A cached value."""
+
+    value: Any
+    """The cached value."""
+    stored_at: float
+    """When the value was stored (`time.monotonic()`)."""
+
+
+class SingleFlight:
+    """Share a single call to a loader between concurrent callers with the same key."""
+
+    def __init__(self) -> None:
+        self._pending: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def run(self, key: Hashable, loader: Callable[[], Awaitable[T_]]) -> T_:
+        """Call `loader`, or wait for the result of the call already running for `key`."""
+        if (pending := self._pending.get(key)) is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._pending[key]
+
+
+class TTLCache:
+    """An in-memory cache of extracted data which expires after `ttl` seconds.
+
+    Concurrent misses for the same key share a single call to the loader.
+    Expired entries are kept for `stale_ttl` more seconds (for `peek`) and are
+    evicted when a later entry is stored. If `maxsize` is set, the oldest entries
+    are also evicted once it is reached.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        maxsize: int | None = None,
+        stale_ttl: float = 0,
+    ) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self._entries: dict[Hashable, CacheEntry] = {}
+        self._loads = SingleFlight()
+        self.version = 0
+        """Incremented whenever an entry is stored."""
+
+    def is_expired(self, entry: CacheEntry) -> bool:
+        """Whether `entry` is older than `ttl`."""
+        return time.monotonic() - entry.stored_at > self.ttl
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        """Get the entry for `key` if it has not expired."""
+        entry = self._entries.get(key)
+        if entry is None or self.is_expired(entry):
+            return None
+
+        return entry
+
+    def peek(self, key: Hashable) -> CacheEntry | None:
+        """Get the entry for `key`, even if it has expired."""
+        return self._entries.get(key)
+
+    def set(self, key: Hashable, value: Any) -> CacheEntry:
+        """Store `value` under `key`."""
+        entry = CacheEntry(value=value, stored_at=time.monotonic())
+        self._entries.pop(key, None)
+
+        # entries are kept in the order they were stored, so the oldest are first
+        while self._entries:
+            oldest = next(iter(self._entries))
+            age = entry.stored_at - self._entries[oldest].stored_at
+            if age <= self.ttl + self.stale_ttl:
+                break
+            del self._entries[oldest]
+
+        if self.maxsize is not None and len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = entry
+        self.version += 1
+        return entry
+
+    def pop(self, key: Hashable) -> CacheEntry | None:
+        """Remove and return the entry for `key`."""
+        return self._entries.pop(key, None)
+
+    def entries(self) -> list[tuple[Hashable, CacheEntry]]:
+        """Get every stored entry, including expired ones not yet evicted."""
+        return list(self._entries.items())
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[T_]]
+    ) -> T_:
+        """Get the value for `key`, calling `loader` to fill it on a miss."""
+        if (entry := self.get(key)) is not None:
+            return entry.value
+
+        async def load() -> T_:
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        return await self._loads.run(key, load)
+
+
+def cached(
+    section: str,
+) -> Callable[[Callable[..., Awaitable[T_]]], Callable[..., Awaitable[T_]]]:
+    """Cache the result of a `Scraper.fetch_*` method in `self.cache`.
+
+    Entries are keyed by `(site, section, *args)`.
+    """
+
+    def decorator(
+        func: Callable[..., Awaitable[T_]],
+    ) -> Callable[..., Awaitable[T_]]:
+        @functools.wraps(func)
+        async def wrapper(self: Any, site: str, *args: Any) -> T_:
+            return await self.cache.get_or_load(
+                (site, section, *args), lambda: func(self, site, *args)
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,215 @@
+import dataclasses
+import gzip
+from typing import Any, Callable, Iterable
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+MIN_SIZE = 1024
+"""Bodies smaller than this (in bytes) are not compressed."""
+
+COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+}
+"""Compressors for each supported content coding, in order of preference.
+
+These favour size over speed, for cached bodies which are only compressed once.
+"""
+
+FAST_COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+}
+"""Cheaper compressors for responses which are compressed on every request."""
+
+COMPRESSIBLE_TYPES = (
+    b"text/",
+    b"application/json",
+    b"application/javascript",
+    b"application/xml",
+    b"image/svg+xml",
+)
+"""Prefixes of content types which are worth compressing."""
+
+if zstandard is not None:
+    # compressors aren't thread-safe, so create one per call
+    COMPRESSORS = {
+        "zstd": lambda data: zstandard.ZstdCompressor(level=10).compress(data),
+        **COMPRESSORS,
+    }
+    FAST_COMPRESSORS = {
+        "zstd": lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+        **FAST_COMPRESSORS,
+    }
+
+if brotli is not None:
+    COMPRESSORS = {
+        "br": lambda data: brotli.compress(data, quality=9),
+        **COMPRESSORS,
+    }
+    FAST_COMPRESSORS = {
+        "br": lambda data: brotli.compress(data, quality=4),
+        **FAST_COMPRESSORS,
+    }
+
+
+@dataclasses.dataclass
+class EncodedBody:
+    """A response body and its compressed variants."""
+
+    raw: bytes
+    """The uncompressed body."""
+    encoded: dict[str, bytes]
+    """The compressed body for each content coding."""
+
+    def select(self, accept_encoding: str | None) -> tuple[str | None, bytes]:
+        """Get the best content coding and body for an `Accept-Encoding` header."""
+        coding = negotiate(accept_encoding, self.encoded)
+        if coding is None:
+            return None, self.raw
+
+        return coding, self.encoded[coding]
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the body and its variants."""
+        return len(self.raw) + sum(len(data) for data in self.encoded.values())
+
+
+def encode_body(
+    raw: bytes,
+    codings: Iterable[str] | None = None,
+    compressors: dict[str, Callable[[bytes], bytes]] = COMPRESSORS,
+) -> EncodedBody:
+    """Compress `raw` with `codings` (every supported content coding by default).
+
+    Bodies below `MIN_SIZE`, and variants which are no smaller than `raw`, are skipped.
+    This is CPU-bound, so run it in a thread when the body is large.
+    """
+    encoded: dict[str, bytes] = {}
+    if len(raw) >= MIN_SIZE:
+        for coding in compressors if codings is None else codings:
+            if len(data := compressors[coding](raw)) < len(raw):
+                encoded[coding] = data
+
+    return EncodedBody(raw=raw, encoded=encoded)
+
+
+def negotiate(accept_encoding: str | None, available: Iterable[str]) -> str | None:
+    """Pick the preferred content coding in `available` which the client accepts."""
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().lower().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip()] = weight
+
+    best: str | None = None
+    best_weight = 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+
+    return best
+
+
+class CompressionMiddleware:
+    """Compress text responses which weren't already compressed by the endpoint.
+
+    Cached responses are precompressed by `encode_body` and set `Content-Encoding`
+    and `Vary` themselves, so they are passed through untouched. Everything else is compressed
+    with `FAST_COMPRESSORS`.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+
+        coding = negotiate(accept_encoding, FAST_COMPRESSORS)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: dict[str, Any] | None = None
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            nonlocal start
+
+            if start is None and message["type"] == "http.response.start":
+                headers = {
+                    name.lower(): value for name, value in message.get("headers", [])
+                }
+                content_type = headers.get(b"content-type", b"")
+                negotiated = b"accept-encoding" in headers.get(b"vary", b"").lower()
+                if (
+                    negotiated
+                    or b"content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    # already encoded by the endpoint or not compressible, stop buffering
+                    start = {}
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if not start or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            raw = b"".join(chunks)
+            encoded = encode_body(raw, [coding], FAST_COMPRESSORS)
+            encoding, body = encoded.select(accept_encoding)
+
+            headers = [
+                (name, value)
+                for name, value in start.get("headers", [])
+                if name.lower() not in (b"content-length", b"vary")
+            ]
+            vary = [
+                value
+                for name, value in start.get("headers", [])
+                if name.lower() == b"vary"
+            ]
+            if not any(b"accept-encoding" in value.lower() for value in vary):
+                vary.append(b"Accept-Encoding")
+            headers.append((b"content-length", str(len(body)).encode()))
+            headers.append((b"vary", b", ".join(vary)))
+            if encoding is not None:
+                headers.append((b"content-encoding", encoding.encode()))
+
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
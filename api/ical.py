@@ -0,0 +1,162 @@
+import datetime
+import hashlib
+from typing import Iterable, Sequence
+
+from api import utils
+from api.models import Activity, Event, Fixture
+
+PRODID = "-//clubsandsocs-api//Clubs & Societies API//EN"
+
+VTIMEZONE = [
+    "BEGIN:VTIMEZONE",
+    "TZID:Europe/Dublin",
+    "BEGIN:DAYLIGHT",
+    "TZOFFSETFROM:+0000",
+    "TZOFFSETTO:+0100",
+    "TZNAME:IST",
+    "DTSTART:19700329T010000",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU",
+    "END:DAYLIGHT",
+    "BEGIN:STANDARD",
+    "TZOFFSETFROM:+0100",
+    "TZOFFSETTO:+0000",
+    "TZNAME:GMT",
+    "DTSTART:19701025T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+]
+"""The `Europe/Dublin` timezone, which times in the feed are given in."""
+
+
+def escape(text: str) -> str:
+    """Escape text for use in a property value."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Fold a content line so no line is longer than 75 octets."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line
+
+    parts: list[str] = []
+    start = 0
+    limit = 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # don't split a multi-byte character
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode())
+        start = end
+        limit = 74
+
+    return "\r\n ".join(parts)
+
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+def local_time(time: datetime.datetime) -> datetime.datetime:
+    """Convert `time` to a naive Dublin time."""
+    return time.astimezone(utils.DUBLIN_TZ).replace(tzinfo=None)
+
+
+def format_time(time: datetime.datetime) -> str:
+    return local_time(time).strftime("%Y%m%dT%H%M%S")
+
+
+def activity_times(activity: Activity) -> tuple[datetime.datetime, datetime.datetime]:
+    """Get an activity's naive Dublin start and end times, moved onto its `day`.
+
+    `start` can fall on another weekday (it's computed in UTC), and RFC 5545
+    would count a `DTSTART` which doesn't match `BYDAY` as an extra occurrence.
+    """
+    start, end = local_time(activity.start), local_time(activity.end)
+    if activity.day not in DAYS:
+        return start, end
+
+    # move to the nearest matching day
+    days = (DAYS.index(activity.day) - start.weekday() + 3) % 7 - 3
+    delta = datetime.timedelta(days=days)
+    return start + delta, end + delta
+
+
+def vevent(
+    item: Activity | Event | Fixture, path: str, stamp: datetime.datetime
+) -> list[str]:
+    """Build the `VEVENT` for an activity, event or fixture of the group at `path`."""
+    if isinstance(item, Activity):
+        # activity start dates move every week, so only the time identifies them
+        identity = f"{item.day}|{format_time(item.start)[9:]}"
+    else:
+        identity = format_time(item.start)
+
+    uid = hashlib.sha1(
+        f"{path}|{type(item).__name__}|{item.name}|{identity}".encode()
+    ).hexdigest()
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}@{path.split('/')[0]}",
+        f"DTSTAMP:{stamp.strftime('%Y%m%dT%H%M%SZ')}",
+    ]
+    if isinstance(item, Activity):
+        start, end = activity_times(item)
+        lines += [
+            f"DTSTART;TZID=Europe/Dublin:{start.strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND;TZID=Europe/Dublin:{end.strftime('%Y%m%dT%H%M%S')}",
+            f"RRULE:FREQ=WEEKLY;BYDAY={item.day[:2].upper()}",
+        ]
+    else:
+        lines.append(f"DTSTART;TZID=Europe/Dublin:{format_time(item.start)}")
+        if not isinstance(item, Fixture):
+            lines.append(f"DTEND;TZID=Europe/Dublin:{format_time(item.end)}")
+
+    lines.append(f"SUMMARY:{escape(item.name)}")
+    if item.location:
+        lines.append(f"LOCATION:{escape(item.location)}")
+    if item.description:
+        lines.append(f"DESCRIPTION:{escape(item.description)}")
+    lines += [
+        f"CATEGORIES:{escape(item.type)}",
+        f"URL:https://{path}",
+        "END:VEVENT",
+    ]
+
+    return lines
+
+
+def build_calendar(
+    name: str,
+    sources: Iterable[tuple[str, Sequence[Activity | Event | Fixture]]],
+    stamp: datetime.datetime,
+) -> bytes:
+    """Build an iCalendar feed of the items of each `(group path, items)` source.
+
+    Activities are emitted as weekly recurring events. `stamp` is the time the
+    feed was last revised.
+    """
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape(name)}",
+        "X-WR-TIMEZONE:Europe/Dublin",
+        *VTIMEZONE,
+    ]
+    for path, items in sources:
+        for item in items:
+            lines += vevent(item, path, stamp)
+    lines.append("END:VCALENDAR")
+
+    return "".join(fold(line) + "\r\n" for line in lines).encode()
@@ -0,0 +1,211 @@
+import asyncio
+import dataclasses
+import hashlib
+import hmac
+import io
+import os
+import pathlib
+import threading
+import urllib.parse
+from typing import Awaitable, Callable
+
+from api.cache import SingleFlight
+
+THUMBNAIL_WIDTHS = (160, 320, 640)
+"""The widths (in pixels) thumbnails can be requested at."""
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+"""The largest image (in bytes) which will be fetched."""
+
+
+@dataclasses.dataclass
+class CachedImage:
+    """An image stored in the image cache."""
+
+    data: bytes
+    """The image."""
+    content_type: str
+    """The image's content type."""
+
+
+def sign(key: bytes, url: str) -> str:
+    """Sign an upstream image URL, so only images the scraper returned are proxied."""
+    return hmac.new(key, url.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def verify(key: bytes, url: str, signature: str) -> bool:
+    """Whether `signature` is the signature of `url`."""
+    return hmac.compare_digest(sign(key, url), signature)
+
+
+def proxy_url(base: str, key: bytes, site: str, src: str) -> str:
+    """Get the signed image proxy URL for an image `src` on `site`.
+
+    Images hosted elsewhere, or with a query string, are returned unchanged.
+    """
+    url = urllib.parse.urlsplit(urllib.parse.urljoin(f"https://{site}/", src))
+    if url.scheme != "https" or url.netloc != site or url.query:
+        return src
+
+    path = urllib.parse.unquote(url.path).lstrip("/")
+    signature = sign(key, upstream_url(site, path))
+    return f"{base.rstrip('/')}/img/{site}/{urllib.parse.quote(path)}?s={signature}"
+
+
+def upstream_url(site: str, path: str) -> str:
+    """Get the URL (without scheme) of the image at `path` on `site`."""
+    return f"{site}/{urllib.parse.quote(path)}"
+
+
+def cache_key(url: str, width: int | None) -> str:
+    """Get the cache key (and ETag) for an image at `url` scaled to `width`."""
+    return hashlib.sha256(f"{url}|{width or ''}".encode()).hexdigest()
+
+
+def make_thumbnail(data: bytes, width: int) -> bytes | None:
+    """Scale an image down to `width` as WebP.
+
+    Returns `None` if Pillow isn't installed, the image can't be read, or it is
+    already narrower than `width`.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width <= width:
+                return None
+
+            image.thumbnail((width, image.height))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+
+            out = io.BytesIO()
+            image.save(out, "WEBP", quality=80)
+            return out.getvalue()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+class ImageCache:
+    """A size-bounded on-disk cache of images and their thumbnails.
+
+    The least recently used files are evicted once `max_bytes` is exceeded.
+    Concurrent misses for the same image share a single fetch.
+    """
+
+    def __init__(self, directory: pathlib.Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size: int | None = None
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+
+    async def get(
+        self,
+        url: str,
+        width: int | None,
+        fetch: Callable[[], Awaitable[tuple[bytes, str]]],
+    ) -> CachedImage:
+        """Get the image at `url` scaled to `width`, calling `fetch` on a miss.
+
+        Thumbnails are generated from the cached original the first time they
+        are requested. If one can't be generated, the original is returned.
+        """
+        key = cache_key(url, width)
+        if (image := await asyncio.to_thread(self._read, key)) is not None:
+            return image
+
+        async def load() -> CachedImage:
+            image, store = await self._load(url, width, fetch)
+            if store:
+                await asyncio.to_thread(self._write, key, image)
+            return image
+
+        return await self._loads.run(key, load)
+
+    async def _load(
+        self,
+        url: str,
+        width: int | None,
+        fetch: Callable[[], Awaitable[tuple[bytes, str]]],
+    ) -> tuple[CachedImage, bool]:
+        """Load an image, and whether it should be stored under its own key."""
+        if width is not None:
+            original = await self.get(url, None, fetch)
+            thumbnail = await asyncio.to_thread(make_thumbnail, original.data, width)
+            if thumbnail is None:
+                # the original is already cached, don't store another copy
+                return original, False
+
+            return CachedImage(data=thumbnail, content_type="image/webp"), True
+
+        data, content_type = await fetch()
+        if not content_type.startswith("image/"):
+            raise ValueError(f"'{url}' is not an image ({content_type})")
+
+        return CachedImage(data=data, content_type=content_type), True
+
+    def _read(self, key: str) -> CachedImage | None:
+        path = self.directory / key
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        # mark as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        content_type, _, data = raw.partition(b"\n")
+        return CachedImage(data=data, content_type=content_type.decode())
+
+    def _write(self, key: str, image: CachedImage) -> None:
+        # writes run in worker threads, and eviction must not see a half-written file
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if self._size is None:
+                self._size = sum(entry.stat().st_size for entry in self._files())
+
+            path = self.directory / key
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(image.content_type.encode() + b"\n" + image.data)
+            size = tmp.stat().st_size
+            try:
+                size -= path.stat().st_size
+            except FileNotFoundError:
+                pass
+            tmp.replace(path)
+            self._size += size
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _files(self) -> list[os.DirEntry[str]]:
+        """Get the cached files, excluding temporary files being written."""
+        return [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        ]
+
+    def _evict(self) -> None:
+        files = sorted(self._files(), key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in files)
+        # leave some headroom so every write doesn't evict
+        target = self.max_bytes * 0.9
+
+        for entry in files:
+            if size <= target:
+                break
+            try:
+                file_size = entry.stat().st_size
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            size -= file_size
+
+        self._size = size
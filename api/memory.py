@@ -0,0 +1,73 @@
+import collections
+import sys
+from typing import Any
+
+from api.cache import TTLCache
+
+ATOMIC_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def deep_sizeof(obj: Any, seen: set[int]) -> int:
+    """Get the size of `obj` and everything it references, in bytes.
+
+    Objects in `seen` (e.g. interned strings shared with other items) are only
+    counted once.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, ATOMIC_TYPES):
+        return size
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), seen)
+
+    return size
+
+
+def usage(
+    cache: TTLCache, responses: TTLCache, feeds: TTLCache
+) -> dict[str, dict[str, int]]:
+    """Get the bytes used per site and per section by `cache`, `responses` and `feeds`.
+
+    Cached responses and calendar feeds are reported under the `responses` and
+    `calendars` sections, including any replaced scraper data they still reference.
+    """
+    sites: dict[str, dict[str, int]] = collections.defaultdict(
+        lambda: collections.defaultdict(int)
+    )
+    seen: dict[str, set[int]] = collections.defaultdict(set)
+
+    for key, entry in cache.entries():
+        assert isinstance(key, tuple)
+        site, section = key[0], key[1]
+        sites[site][section] += deep_sizeof(entry.value, seen[site])
+
+    for key, entry in responses.entries():
+        assert isinstance(key, tuple)
+        site = key[0].split("/")[1]
+        # source data still in `cache` is already in `seen`, but data replaced by a
+        # later scrape is only kept alive by the response, so count it here
+        sites[site]["responses"] += deep_sizeof(entry.value, seen[site])
+
+    for key, entry in feeds.entries():
+        assert isinstance(key, str)
+        site = key.split("/")[1]
+        sites[site]["calendars"] += deep_sizeof(entry.value, seen[site])
+
+    return {
+        site: {**sections, "total": sum(sections.values())}
+        for site, sections in sorted(sites.items())
+    }
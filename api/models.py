@@ -0,0 +1,156 @@
+import dataclasses
+import datetime
+import enum
+
+
+class GroupType(enum.Enum):
+    """The group type."""
+
+    CLUB = "club"
+    """A club."""
+    SOCIETY = "society"
+    """A society."""
+
+
+class EventType(enum.Enum):
+    """The event type."""
+
+    ACTIVITY = "activities"
+    """An activity."""
+    EVENT = "events"
+    """An event."""
+    FIXTURE = "fixtures"
+    """A fixture."""
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Event:
+    """An event."""
+
+    name: str
+    """The event name."""
+    image: str | None
+    """The event poster."""
+    start: datetime.datetime
+    """The event's start time."""
+    end: datetime.datetime
+    """The event's end time."""
+    day: str
+    """The day the event is on (`monday`, `tuesday`, etc.)."""
+    cost: float
+    """The event cost."""
+    capacity: int | None
+    """The event maximum capacity."""
+    type: str
+    """The event type. Usually `IN-PERSON` or `VIRTUAL`."""
+    location: str | None
+    """The event location."""
+    description: str
+    """The event description."""
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Activity:
+    """A weekly activity."""
+
+    name: str
+    """The activity name."""
+    image: str | None
+    """The activity poster."""
+    day: str
+    """The day the activity is on (`monday`, `tuesday`, etc.)."""
+    start: datetime.datetime
+    """The activity start time."""
+    end: datetime.datetime
+    """The activity end time."""
+    capacity: int | None
+    """The activity maximum capacity."""
+    type: str
+    """The activity type. Usually `IN-PERSON` or `VIRTUAL`."""
+    location: str | None
+    """The activity location."""
+    description: str
+    """The activity description."""
+    
+@dataclasses.dataclass(slots=True, frozen=True)
+class Fixture:
+    """A fixture."""
+
+    name: str
+    """The fixture name."""
+    image: str | None
+    """The fixture poster."""
+    start: datetime.datetime
+    """The fixture's start time."""
+    competition: str
+    """The fixture competition."""
+    type: str
+    """The fixture type. Usually `HOME` or `AWAY`."""
+    location: str | None
+    """The fixture location."""
+    description: str
+    """The fixture description."""
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class CommitteeMember:
+    """A committee member."""
+
+    name: str | None
+    """Their name. (`None` if hidden)."""
+    position: str
+    """Their committee position."""
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class ClubSoc:
+    """A club or society."""
+
+    id: str
+    """The ID used in the club or society's page URL."""
+    name: str
+    """The club or society name."""
+    is_locked: bool
+    """Whether the club or society is locked."""
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class InfoLink:
+    """A link in the club or society's info."""
+
+    name: str
+    """The link name."""
+    url: str
+    """The link URL."""
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Info:
+    """Info on a club or society."""
+
+    id: str
+    """The ID used in the club or society's page URL."""
+    name: str
+    """The club or society name."""
+    icon: str | None
+    """The club or society icon."""
+    title: str
+    """The club or society title."""
+    about: str | None
+    """Info on the club or society."""
+
+    links: list[InfoLink] | None
+    """Links provided by the club or society."""
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class InfoAward:
+    """An award in the club or society's info."""
+
+    year: str
+    """The year the award was won."""
+    name: str
+    """The award name."""
+    winner: str
+    """The award winner."""
+    type: str
+    """The award type."""
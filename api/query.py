@@ -0,0 +1,72 @@
+import dataclasses
+import datetime
+from typing import Any, Sequence, TypeVar
+
+from api import utils
+
+T_ = TypeVar("T_")
+
+
+def filter_items(
+    items: Sequence[T_],
+    *,
+    is_locked: bool | None = None,
+    day: str | None = None,
+    type: str | None = None,
+    start_after: datetime.datetime | None = None,
+    start_before: datetime.datetime | None = None,
+) -> list[T_]:
+    """Filter cached items by their attributes. Filters set to `None` are ignored.
+
+    `day` and `type` are matched case-insensitively. Naive datetimes are assumed
+    to be in Dublin time.
+    """
+    if start_after is not None:
+        start_after = _localize(start_after)
+    if start_before is not None:
+        start_before = _localize(start_before)
+
+    def matches(item: Any) -> bool:
+        if is_locked is not None and item.is_locked is not is_locked:
+            return False
+        if day is not None and item.day.casefold() != day.casefold():
+            return False
+        if type is not None and item.type.casefold() != type.casefold():
+            return False
+        if start_after is not None and item.start < start_after:
+            return False
+        if start_before is not None and item.start > start_before:
+            return False
+        return True
+
+    return [item for item in items if matches(item)]
+
+
+def paginate(items: Sequence[T_], offset: int, limit: int | None) -> Sequence[T_]:
+    """Get the page of `items` starting at `offset` with at most `limit` items."""
+    if limit is None:
+        return items[offset:]
+
+    return items[offset : offset + limit]
+
+
+def parse_fields(fields: str, model: type) -> list[str]:
+    """Parse a comma-separated list of `model`'s field names."""
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    valid = [field.name for field in dataclasses.fields(model)]
+
+    if not names:
+        raise ValueError("no fields given")
+    if unknown := [name for name in names if name not in valid]:
+        raise ValueError(
+            f"unknown field(s) {', '.join(unknown)} (expected {', '.join(valid)})"
+        )
+
+    return names
+
+
+def _localize(time: datetime.datetime) -> datetime.datetime:
+    if time.tzinfo is None:
+        time = utils.DUBLIN_TZ.localize(time)
+
+    return time
@@ -1,33 +1,23 @@
-import dataclasses
 import datetime
-import enum
 import re
 
 import aiohttp
 from bs4 import BeautifulSoup, ResultSet, Tag
 
-from api import types, utils
-
-
-class GroupType(enum.Enum):
-    """The group type."""
-
-    CLUB = "club"
-    """A club."""
-    SOCIETY = "society"
-    """A society."""
-
-
-class EventType(enum.Enum):
-    """The event type."""
-
-    ACTIVITY = "activities"
-    """An activity."""
-    EVENT = "events"
-    """An event."""
-    FIXTURE = "fixtures"
-    """A fixture."""
-
+from api import images, types, utils
+from api.cache import TTLCache, cached
+from api.models import (
+    Activity,
+    ClubSoc,
+    CommitteeMember,
+    Event,
+    EventType,
+    Fixture,
+    GroupType,
+    Info,
+    InfoAward,
+    InfoLink,
+)
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; rv:130.0) Gecko/20100101 Firefox/130.0"
@@ -35,142 +25,21 @@ HEADERS = {
 CLUB_SOC_PATH = "{site}/{type}/{id}"
 
 
-@dataclasses.dataclass
-class Event:
-    """An event."""
-
-    name: str
-    """The event name."""
-    image: str | None
-    """The event poster."""
-    start: datetime.datetime
-    """The event's start time."""
-    end: datetime.datetime
-    """The event's end time."""
-    day: str
-    """The day the event is on (`monday`, `tuesday`, etc.)."""
-    cost: float
-    """The event cost."""
-    capacity: int | None
-    """The event maximum capacity."""
-    type: str
-    """The event type. Usually `IN-PERSON` or `VIRTUAL`."""
-    location: str | None
-    """The event location."""
-    description: str
-    """The event description."""
-
-
-@dataclasses.dataclass
-class Activity:
-    """A weekly activity."""
-
-    name: str
-    """The activity name."""
-    image: str | None
-    """The activity poster."""
-    day: str
-    """The day the activity is on (`monday`, `tuesday`, etc.)."""
-    start: datetime.datetime
-    """The activity start time."""
-    end: datetime.datetime
-    """The activity end time."""
-    capacity: int | None
-    """The activity maximum capacity."""
-    type: str
-    """The activity type. Usually `IN-PERSON` or `VIRTUAL`."""
-    location: str | None
-    """The activity location."""
-    description: str
-    """The activity description."""
-    
-@dataclasses.dataclass
-class Fixture:
-    """A fixture."""
-
-    name: str
-    """The fixture name."""
-    image: str | None
-    """The fixture poster."""
-    start: datetime.datetime
-    """The fixture's start time."""
-    competition: str
-    """The fixture competition."""
-    type: str
-    """The fixture type. Usually `HOME` or `AWAY`."""
-    location: str | None
-    """The fixture location."""
-    description: str
-    """The fixture description."""
-
-
-@dataclasses.dataclass
-class CommitteeMember:
-    """A committee member."""
-
-    name: str | None
-    """Their name. (`None` if hidden)."""
-    position: str
-    """Their committee position."""
-
-
-@dataclasses.dataclass
-class ClubSoc:
-    """A club or society."""
-
-    id: str
-    """The ID used in the club or society's page URL."""
-    name: str
-    """The club or society name."""
-    is_locked: bool
-    """Whether the club or society is locked."""
-
-@dataclasses.dataclass
-class InfoLink:
-    """A link in the club or society's info."""
-
-    name: str
-    """The link name."""
-    url: str
-    """The link URL."""
-
-
-@dataclasses.dataclass
-class Info:
-    """Info on a club or society."""
-
-    id: str
-    """The ID used in the club or society's page URL."""
-    name: str
-    """The club or society name."""
-    icon: str | None
-    """The club or society icon."""
-    title: str
-    """The club or society title."""
-    about: str | None
-    """Info on the club or society."""
-
-    links: list[InfoLink] | None
-    """Links provided by the club or society."""
-
-
-@dataclasses.dataclass
-class InfoAward:
-    """An award in the club or society's info."""
-
-    year: str
-    """The year the award was won."""
-    name: str
-    """The award name."""
-    winner: str
-    """The award winner."""
-    type: str
-    """The award type."""
-
-
 class Scraper:
-    def __init__(self) -> None:
+    def __init__(
+        self, image_proxy: str | None = None, image_proxy_key: bytes = b""
+    ) -> None:
         self._session: aiohttp.ClientSession | None = None
+        self.cache = TTLCache(maxsize=10_000, stale_ttl=60 * 60)
+        """Extracted data, keyed by `(site, section, *args)`.
+
+        Expired data is kept for an hour so calendar feeds can serve it while it's
+        refreshed.
+        """
+        self.image_proxy = image_proxy
+        """The URL of the API to return image proxy URLs for (`None` to return upstream URLs)."""
+        self.image_proxy_key = image_proxy_key
+        """The key image proxy URLs are signed with."""
 
     @property
     def session(self) -> aiohttp.ClientSession:
@@ -180,6 +49,11 @@ class Scraper:
 
         return self._session
 
+    async def close(self) -> None:
+        """Close the session, if one was opened."""
+        if self._session:
+            await self._session.close()
+
     async def get(self, url: str) -> bytes:
         """Make a `GET` request to `url`."""
         async with self.session.request(
@@ -189,6 +63,30 @@ class Scraper:
             r.raise_for_status()
             return await r.read()
 
+    async def fetch_image(self, url: str) -> tuple[bytes, str]:
+        """Fetch the image at `url` and its content type."""
+        async with self.session.request(
+            "GET",
+            f"https://{url}",
+        ) as r:
+            r.raise_for_status()
+
+            data = bytearray()
+            async for chunk in r.content.iter_chunked(64 * 1024):
+                data += chunk
+                if len(data) > images.MAX_IMAGE_SIZE:
+                    raise ValueError(f"'{url}' is too large")
+
+            return bytes(data), r.content_type
+
+    def image_url(self, site: str, src: str) -> str:
+        """Get the URL to return for an image `src` on `site`."""
+        if self.image_proxy is None:
+            return src
+
+        return images.proxy_url(self.image_proxy, self.image_proxy_key, site, src)
+
+    @cached("group")
     async def fetch_group(self, site: str, group_type: GroupType) -> list[ClubSoc]:
         """Fetch items items belonging to a group (clubs or societies)."""
         data = await self.get(
@@ -331,12 +229,12 @@ class Scraper:
                     Activity(
                         name=event_name,
                         image=event_image,
-                        day=day,
+                        day=utils.intern_str(day),
                         start=start,
                         end=end,
                         capacity=int(capacity) if capacity is not None else capacity,
-                        type=type_,
-                        location=location,
+                        type=utils.intern_str(type_),
+                        location=utils.intern_str(location),
                         description=description,
                     )
                 )
@@ -355,8 +253,8 @@ class Scraper:
                         image=event_image,
                         start=start,
                         competition=None,
-                        type=type_,
-                        location=location,
+                        type=utils.intern_str(type_),
+                        location=utils.intern_str(location),
                         description=description,
                     )
                 )
@@ -381,13 +279,13 @@ class Scraper:
                     Event(
                         name=event_name,
                         image=event_image,
-                        day=day,
+                        day=utils.intern_str(day),
                         start=start,
                         end=end,
                         cost=cost,
                         capacity=int(capacity) if capacity is not None else capacity,
-                        type=type_,
-                        location=location,
+                        type=utils.intern_str(type_),
+                        location=utils.intern_str(location),
                         description=description,
                     )
                 )
@@ -396,6 +294,7 @@ class Scraper:
 
         return events
 
+    @cached("committee")
     async def fetch_committee(
         self, site: str, id: str, group_type: GroupType
     ) -> list[CommitteeMember]:
@@ -417,12 +316,13 @@ class Scraper:
                     name=None
                     if (name := name_.text.strip()) == "(name hidden)"
                     else name,
-                    position=role.text.strip(),
+                    position=utils.intern_str(role.text.strip()),
                 )
             )
 
         return committee
 
+    @cached("gallery")
     async def fetch_gallery(
         self, site: str, id: str, group_type: GroupType
     ) -> list[str]:
@@ -438,18 +338,18 @@ class Scraper:
             return []
 
         assert isinstance(gallery, Tag)
-        images: ResultSet[Tag] = gallery.find_all("img")
+        imgs: ResultSet[Tag] = gallery.find_all("img")
 
         urls: list[str] = []
-        for img in images:
+        for img in imgs:
             img = img["src"]
             if isinstance(img, list):
-                urls.append(img[0])
-            else:
-                urls.append(img)
+                img = img[0]
+            urls.append(self.image_url(site, img))
 
         return urls
 
+    @cached("activities")
     async def fetch_activities(
         self, site: str, id: str, group_type: GroupType
     ) -> list[Activity]:
@@ -460,6 +360,7 @@ class Scraper:
         assert types.is_obj_list(activities, Activity)
         return activities
 
+    @cached("events")
     async def fetch_events(
         self, site: str, id: str, group_type: GroupType
     ) -> list[Event]:
@@ -470,6 +371,7 @@ class Scraper:
         assert types.is_obj_list(events, Event)
         return events
     
+    @cached("fixtures")
     async def fetch_fixtures(
         self, site: str, id: str, group_type: GroupType
     ) -> list[Fixture]:
@@ -480,6 +382,7 @@ class Scraper:
         assert types.is_obj_list(fixtures, Fixture)
         return fixtures
 
+    @cached("info")
     async def fetch_info(
         self,
         site: str,
@@ -531,7 +434,8 @@ class Scraper:
             img = img["src"]
             if isinstance(img, list):
                 img = img[0]
-                
+            img = self.image_url(site, img)
+
 
         return Info(
             id=id,
@@ -543,6 +447,7 @@ class Scraper:
         )
         
         
+    @cached("awards")
     async def fetch_awards(
         self, site: str, id: str, group_type: GroupType
     ) -> list[InfoAward]:
@@ -567,10 +472,13 @@ class Scraper:
             type_ = award.find("td").find("small").text.strip().replace(":","")
             
             
-            awards_list.append(InfoAward(year, name, winner, type_))
+            awards_list.append(
+                InfoAward(utils.intern_str(year), name, winner, utils.intern_str(type_))
+            )
 
         return awards_list
     
+    @cached("links")
     async def fetch_links(
         self, site: str, id: str, group_type: GroupType
     ) -> list[InfoLink]:
@@ -1,13 +1,20 @@
 import datetime
 import enum
+import functools
 import re
+import sys
+from typing import TYPE_CHECKING, TypeVar
 
-import parsedatetime
 import pytz
 
+if TYPE_CHECKING:
+    import parsedatetime
+
 
 DUBLIN_TZ = pytz.timezone("Europe/Dublin")
 
+S_ = TypeVar("S_", str, None)
+
 
 class TimePeriod(enum.Enum):
     NONE = 0
@@ -16,19 +23,36 @@ class TimePeriod(enum.Enum):
     DATETIME = 3
 
 
-PARSER = parsedatetime.Calendar(parsedatetime.Constants("en_GB"))
 WHITESPACE_REGEX = re.compile(r"^\s+|\s+$|\s+(?=\s)")
 
 
+@functools.cache
+def get_parser() -> "parsedatetime.Calendar":
+    """Get the datetime parser, importing and constructing it on first use."""
+    import parsedatetime
+
+    return parsedatetime.Calendar(parsedatetime.Constants("en_GB"))
+
+
 def strip_whitespace(text: str) -> str:
     return re.sub(WHITESPACE_REGEX, "", text.replace("\xa0", " "))
 
 
+def intern_str(text: S_) -> S_:
+    """Intern a repeated, low-cardinality string (e.g. a day or location)."""
+    if text is None:
+        return None
+
+    return sys.intern(text)
+
+
 def str_to_datetime(
     text: str,
     base_time: datetime.datetime | None = None,
 ) -> datetime.datetime:
-    time, result = PARSER.parseDT(text, base_time)
+    import parsedatetime
+
+    time, result = get_parser().parseDT(text, base_time)
 
     if isinstance(result, parsedatetime.pdtContext):
         result = result.dateTimeFlag
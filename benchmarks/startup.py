@@ -0,0 +1,180 @@
+"""Benchmark the API's cold start.
+
+Each run starts a fresh interpreter, imports `api.app` and sends it a request
+directly over ASGI, measuring:
+
+- `import`: the time taken to import `api.app`
+- `first_response`: the time from the start of the import to the end of the
+  first response, including any deferred imports the request needs
+
+The default request scrapes a club's events from a stubbed page, so it loads
+and constructs everything a real first request would (bs4, html5lib, aiohttp
+and parsedatetime) without touching the network.
+
+Run from the repository root:
+
+    python benchmarks/startup.py --runs 10
+
+Exits with status 1 if a median exceeds its `--max-*-ms` threshold, or if the
+request fails.
+"""
+
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+RUN = """
+import asyncio
+import json
+import time
+
+start = time.perf_counter()
+import api.app
+from api.app import app
+imported = time.perf_counter()
+
+PAGE = PAGE_HTML
+
+
+async def get(url):
+    return PAGE
+
+
+get_scraper = api.app.get_scraper
+
+
+def get_stubbed_scraper():
+    # serve the stub page instead of fetching the university website
+    scraper = get_scraper()
+    scraper.get = get
+    return scraper
+
+
+api.app.get_scraper = get_stubbed_scraper
+
+
+async def request(path):
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(
+        {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"accept-encoding", b"gzip")],
+            "server": ("localhost", 4000),
+            "client": ("127.0.0.1", 0),
+        },
+        receive,
+        send,
+    )
+    return status
+
+
+status = asyncio.run(request(PATH))
+responded = time.perf_counter()
+print(
+    json.dumps(
+        {
+            "status": status,
+            "import": (imported - start) * 1000,
+            "first_response": (responded - start) * 1000,
+        }
+    )
+)
+"""
+
+PAGE = b"""<!DOCTYPE html>
+<html><body>
+<div id="events">
+  <span class="float-right badge badge-light">1</span>
+  <div class="table-responsive"><table>
+    <tr class="show_info pointer"><th class="h5 align-middle">Table Quiz</th></tr>
+    <tr class="show_info pointer">
+      <td class="text-center align-middle">Event Type<br><b>IN-PERSON</b></td>
+      <td class="text-center align-middle">Start<br><b>20th October 2026 18:00</b></td>
+      <td class="text-center align-middle">End<br><b>20th October 2026 20:00</b></td>
+      <td class="text-center align-middle">Cost<br><b>FREE</b></td>
+      <td class="text-center align-middle">Max<br><b>40</b></td>
+    </tr>
+    <tr class="d-none"><td></td></tr>
+    <tr class="d-none"><td>Location<br><b>The Hub</b><p>Bring a pen.</p></td></tr>
+  </table></div>
+</div>
+</body></html>
+"""
+"""A club page with one event, served instead of the university website."""
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def run(path: str) -> dict[str, float]:
+    script = RUN.replace("PAGE_HTML", repr(PAGE)).replace("PATH", repr(path))
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts")
+    parser.add_argument(
+        "--path",
+        default="/example.ie/society/quiz/events",
+        help="path to request (pages are served from the stub page)",
+    )
+    parser.add_argument("--max-import-ms", type=float, default=1000)
+    parser.add_argument("--max-first-response-ms", type=float, default=2000)
+    args = parser.parse_args()
+
+    results = [run(args.path) for _ in range(args.runs)]
+    for result in results:
+        if result["status"] != 200:
+            print(f"request failed with status {result['status']}", file=sys.stderr)
+            sys.exit(1)
+
+    medians = {
+        name: statistics.median(result[name] for result in results)
+        for name in ("import", "first_response")
+    }
+
+    for name, median in medians.items():
+        print(f"{name}: {median:.1f}ms (median of {args.runs})")
+
+    failed = False
+    for name, limit in (
+        ("import", args.max_import_ms),
+        ("first_response", args.max_first_response_ms),
+    ):
+        if limit is not None and medians[name] > limit:
+            print(f"{name} exceeded {limit:.1f}ms", file=sys.stderr)
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()